@@ -1,7 +1,13 @@
-"""__init__.py"""
+"""__init__.py
+
+Submodules are imported lazily (PEP 562), on first use of one of their names.
+A headless worker that only runs ngspice and parses results never loads
+matplotlib or scipy.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-from .analyses import Analyses
-from .control import Control
 from .globals_types import (
     numpy_flt,
     AnaType,
@@ -9,35 +15,110 @@ from .globals_types import (
     PLOT_DATA,
     TIME_AXIS,
     FREQ_AXIS,
+    Key,
 )
-from .kicad_netlist import KicadNetlist
-from .step_info import StepInfo
-from .netlist import Netlist
-from .plot import display_plots
-from .plot import Plot
-from .print_section import print_section
-from .simulate import Simulate
-from .sim_results import SimResults
-from .vectors import Vectors
-from .waveforms import Waveforms
+
+if TYPE_CHECKING:
+    from .analyses import Analyses
+    from .arrow_io import write_sweep_dataset
+    from .control import Control
+    from .kicad_netlist import KicadNetlist
+    from .kicad_netlist import export_netlists
+    from .step_info import StepInfo
+    from .surrogate import Surrogate
+    from .switching_info import SwitchingInfo
+    from .table_store import TableStore
+    from .netlist import Netlist
+    from .param_search import ParamSearch
+    from .plot import display_plots
+    from .plot import Plot
+    from .plot import PlotSpec
+    from .plot import render_pngs
+    from .print_section import print_section
+    from .regression import RegressionReport
+    from .regression import compare_results
+    from .regression import load_golden
+    from .regression import save_golden
+    from .simulate import Simulate
+    from .spectrum import Spectrum
+    from .sim_results import SimResults
+    from .vectors import Vectors
+    from .waveforms import Waveforms
+
+# public name -> submodule that defines it
+_LAZY_NAMES: dict[str, str] = {
+    "Analyses": "analyses",
+    "write_sweep_dataset": "arrow_io",
+    "Control": "control",
+    "KicadNetlist": "kicad_netlist",
+    "export_netlists": "kicad_netlist",
+    "StepInfo": "step_info",
+    "Surrogate": "surrogate",
+    "SwitchingInfo": "switching_info",
+    "TableStore": "table_store",
+    "Netlist": "netlist",
+    "ParamSearch": "param_search",
+    "display_plots": "plot",
+    "Plot": "plot",
+    "PlotSpec": "plot",
+    "render_pngs": "plot",
+    "print_section": "print_section",
+    "RegressionReport": "regression",
+    "compare_results": "regression",
+    "load_golden": "regression",
+    "save_golden": "regression",
+    "Simulate": "simulate",
+    "Spectrum": "spectrum",
+    "SimResults": "sim_results",
+    "Vectors": "vectors",
+    "Waveforms": "waveforms",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the submodule for a public name the first time it is used"""
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_LAZY_NAMES[name]}", __name__), name)
+    globals()[name] = value  # cache, so __getattr__ is not called again
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_NAMES))
+
 
 __all__ = (
     "Analyses",
     "Control",
     "KicadNetlist",
+    "export_netlists",
     "Netlist",
+    "ParamSearch",
     "display_plots",
     "Plot",
+    "PlotSpec",
+    "render_pngs",
     "print_section",
+    "RegressionReport",
+    "compare_results",
+    "load_golden",
+    "save_golden",
     "Simulate",
     "SimResults",
+    "Spectrum",
     "StepInfo",
+    "Surrogate",
+    "SwitchingInfo",
+    "TableStore",
     "Vectors",
     "Waveforms",
+    "write_sweep_dataset",
     "numpy_flt",
     "AnaType",
     "TABLE_DATA",
     "PLOT_DATA",
     "TIME_AXIS",
     "FREQ_AXIS",
+    "Key",
 )
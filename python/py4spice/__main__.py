@@ -0,0 +1,7 @@
+"""python -m py4spice: run the simulations of projects in config.toml"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
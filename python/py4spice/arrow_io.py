@@ -0,0 +1,158 @@
+"""Export simulation results to Arrow tables and Parquet files.
+
+pyarrow is an optional dependency: it is only imported when an export is run.
+"""
+
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from .globals_types import AnaType, numpy_flt
+
+# keys for schema metadata
+META_ANALYSIS_TYPE = b"py4spice.analysis_type"
+META_HEADER = b"py4spice.header"
+META_PARAMS = b"py4spice.params"
+META_UNITS = b"units"
+
+# units of the x-axis names used by ngspice
+X_AXIS_UNITS: dict[str, str] = {"time": "s", "frequency": "Hz"}
+
+
+def _pyarrow() -> Any:
+    """import pyarrow, with an explanation if it is not installed"""
+    try:
+        import pyarrow  # type: ignore
+    except ImportError as err:
+        raise ImportError(
+            "Error: Arrow/Parquet export needs pyarrow (pip install pyarrow)"
+        ) from err
+    return pyarrow
+
+
+def vec_units(name: str) -> str:
+    """Guess the units of a vector from its name"""
+    if name in X_AXIS_UNITS:
+        return X_AXIS_UNITS[name]
+    if name.endswith("-mag"):
+        return "dB"
+    if name.endswith("-phase"):
+        return "deg"
+    if name.startswith("i(") or name.endswith("#branch"):
+        return "A"
+    return "V"
+
+
+def _schema_metadata(
+    analysis_type: AnaType, header: list[str], params: Optional[dict[str, Any]]
+) -> dict[bytes, bytes]:
+    """table level metadata"""
+    return {
+        META_ANALYSIS_TYPE: analysis_type.encode(),
+        META_HEADER: json.dumps(header).encode(),
+        META_PARAMS: json.dumps(params or {}).encode(),
+    }
+
+
+def plot_to_arrow(
+    analysis_type: AnaType,
+    header: list[str],
+    data: numpy_flt,
+    params: Optional[dict[str, Any]] = None,
+    units: Optional[dict[str, str]] = None,
+) -> Any:
+    """Create an Arrow table from plot data (one column per vector).
+
+    Columns are zero-copy views of the numpy data when it is column-major
+    (Fortran order), as SimResults.from_file(lean=True) returns it. Row-major
+    data (the default from_file path, Waveforms) is converted once, as a
+    whole block.
+    """
+    pa = _pyarrow()
+    units = units or {}
+    columns_data = np.asfortranarray(data)
+
+    fields = []
+    arrays = []
+    for i, name in enumerate(header):
+        unit = units.get(name, vec_units(name))
+        field_type = pa.from_numpy_dtype(columns_data.dtype)  # float32 kept
+        fields.append(pa.field(name, field_type, metadata={META_UNITS: unit}))
+        arrays.append(pa.array(columns_data[:, i]))
+    schema = pa.schema(fields, metadata=_schema_metadata(analysis_type, header, params))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def table_to_arrow(
+    analysis_type: AnaType,
+    data_table: dict[str, float],
+    params: Optional[dict[str, Any]] = None,
+) -> Any:
+    """Create a one row Arrow table from table data (op, tf, sens)"""
+    pa = _pyarrow()
+    header = list(data_table)
+    fields = [
+        pa.field(name, pa.float64(), metadata={META_UNITS: vec_units(name)})
+        for name in header
+    ]
+    schema = pa.schema(fields, metadata=_schema_metadata(analysis_type, header, params))
+    return pa.Table.from_pydict({k: [v] for k, v in data_table.items()}, schema=schema)
+
+
+def write_parquet(table: Any, filename: Path) -> None:
+    """Write an Arrow table (with its metadata) to a Parquet file"""
+    pa = _pyarrow()
+    import pyarrow.parquet as pq  # type: ignore
+
+    if not isinstance(table, pa.Table):
+        raise TypeError("Error: write_parquet needs a pyarrow Table")
+    pq.write_table(table, str(filename))
+
+
+def write_sweep_dataset(
+    tables: list[Any],
+    params: list[dict[str, Any]],
+    dataset_dir: Path,
+    partition_cols: Optional[list[str]] = None,
+) -> None:
+    """Append a batch of sweep results to a partitioned Parquet dataset.
+
+    The sweep parameters of each result become columns, and the whole batch is
+    written as one file per partition (hive style, e.g. analysis_type=tran/).
+    Partition on a few coarse columns, not on every swept value, to avoid
+    thousands of small files.
+
+    Args:
+        tables (list[Any]): Arrow tables from plot_to_arrow or table_to_arrow
+        params (list[dict[str, Any]]): sweep parameters, one dict per table
+        dataset_dir (Path): root directory of the dataset
+        partition_cols (Optional[list[str]]): defaults to ["analysis_type"]
+    """
+    pa = _pyarrow()
+    import pyarrow.dataset as ds  # type: ignore
+
+    if len(tables) != len(params):
+        raise ValueError("Error: need one params dict for each table")
+    partition_cols = partition_cols or ["analysis_type"]
+
+    batch = []
+    for table, param in zip(tables, params):
+        analysis_type = table.schema.metadata[META_ANALYSIS_TYPE].decode()
+        extra = {"analysis_type": analysis_type, **param}
+        for name, value in extra.items():
+            table = table.append_column(name, pa.array([value] * table.num_rows))
+        batch.append(table.replace_schema_metadata(None))
+
+    combined = pa.concat_tables(batch, promote_options="default")
+    ds.write_dataset(
+        combined,
+        str(dataset_dir),
+        format="parquet",
+        partitioning=partition_cols,
+        partitioning_flavor="hive",
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
@@ -0,0 +1,210 @@
+"""Command line: run the simulations of one or more projects in config.toml
+
+    python -m py4spice [--config CONFIG] [--jobs N] [--list] [PROJECT ...]
+
+With no PROJECT, the GLOBAL PROJECT of the config file is run; "all" runs every
+project. The top*.cir netlists of all selected projects are simulated on one
+shared pool of workers.
+
+Only the ngspice step of a project is run: the committed top*.cir netlists are
+simulated as they are, and the results are not processed or plotted. Netlists
+that write the same result file run one after the other, so only the last one's
+results are left. To regenerate a book section (results, tables and plots), run
+its notebook.
+
+The top*.cir files are written by the project notebooks, with the absolute
+result paths of the machine that ran them. Re-run a project's notebook (with
+the current config.toml) before using this command on it. A netlist that does
+not write its result files, and a project without top*.cir netlists, are
+reported as failed.
+"""
+
+import argparse
+import re
+import subprocess
+import time
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+from .globals_types import Key
+from .simulate import Simulate
+
+DEFAULT_CONFIG: Path = Path("config.toml")
+
+# control lines that write result files: "wrdata FILE ..." or "print ... > FILE"
+RESULT_FILE_RE = re.compile(
+    r"^\s*(?:wrdata\s+(\S+)|print\b.*>\s*(\S+)\s*$)", re.IGNORECASE
+)
+
+
+class Project:
+    """A project section of the config file and its top-level netlists"""
+
+    def __init__(self, name: str, config: dict[str, Any]) -> None:
+        self.name = name
+        glob: dict[str, Any] = config[Key.GLOBAL]
+        self.ngspice_exe: Path = Path(glob[Key.NGSPICE_EXE_STR])
+        self.proj_path: Path = Path(config[name][Key.PROJ_PATH_STR])
+        self.netlists_path: Path = self.proj_path / glob[Key.NETLISTS_DIR_STR]
+        self.results_path: Path = self.proj_path / glob[Key.RESULTS_DIR_STR]
+        self.transcript_filename: Path = (
+            self.results_path / glob[Key.SIM_TRANSCRIPT_STR]
+        )
+        self.sim_times: list[float] = []  # seconds, per top netlist
+        self.failures: list[str] = []
+        self.start: float = 0.0
+        self.end: float = 0.0
+
+    @property
+    def top_netlists(self) -> list[Path]:
+        """top*.cir netlists, in numeric order (top2 before top10)"""
+        tops = self.netlists_path.glob("top*.cir")
+        return sorted(tops, key=lambda top: (len(top.stem), top.stem))
+
+    def prepare(self) -> None:
+        """create the results directory and an empty transcript file"""
+        self.results_path.mkdir(parents=True, exist_ok=True)
+        self.transcript_filename.write_text("")
+
+    def sim_groups(self) -> list[list[Path]]:
+        """Top netlists grouped so that netlists writing the same result file are
+        in one group (run in order); different groups can run in parallel."""
+        tops = self.top_netlists
+        groups: list[tuple[set[str], list[Path]]] = []  # (result files, tops)
+        for top in tops:
+            files = _result_files(top)
+            group_tops = [top]
+            others: list[tuple[set[str], list[Path]]] = []
+            for group_files, other_tops in groups:
+                if group_files & files:  # shares a result file: merge
+                    files |= group_files
+                    group_tops.extend(other_tops)
+                else:
+                    others.append((group_files, other_tops))
+            groups = others + [(files, sorted(group_tops, key=tops.index))]
+        return [group_tops for _, group_tops in groups]
+
+
+def _result_files(netlist_filename: Path) -> set[str]:
+    """result files written by the control section of a netlist"""
+    files: set[str] = set()
+    for line in netlist_filename.read_text().splitlines():
+        match = RESULT_FILE_RE.match(line)
+        if match:
+            files.add(match.group(1) or match.group(2))
+    return files
+
+
+def _run_group(project: Project, tops: list[Path]) -> None:
+    """simulate a group of top netlists, one after the other"""
+    for top in tops:
+        sim = Simulate(
+            ngspice_exe=project.ngspice_exe,
+            netlist_filename=top,
+            transcript_filename=project.transcript_filename,
+            name=f"{project.name}/{top.stem}",
+        )
+        # results of an earlier netlist (or run) must not count for this one
+        result_files = sorted(_result_files(top))
+        for name in result_files:
+            Path(name).unlink(missing_ok=True)
+
+        start = time.perf_counter()
+        try:
+            sim.run()
+        except (subprocess.CalledProcessError, OSError) as err:
+            project.failures.append(f"{top.name}: {err}")
+        else:
+            if sim.timed_out:
+                project.failures.append(f"{top.name}: timed out")
+            else:
+                project.failures.extend(
+                    f"{top.name}: {name} not written (re-run the notebook?)"
+                    for name in result_files
+                    if not Path(name).exists()
+                )
+        end = time.perf_counter()
+        project.sim_times.append(end - start)
+        project.start = min(project.start, start) if project.start else start
+        project.end = max(project.end, end)
+
+
+def run_projects(projects: list[Project], jobs: Optional[int] = None) -> None:
+    """Run the simulations of all projects on one shared pool of workers"""
+    for project in projects:
+        project.prepare()
+        if not project.top_netlists:
+            project.failures.append(f"no top*.cir netlists in {project.netlists_path}")
+
+    # ngspice runs in its own process, so threads are enough to overlap them
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(_run_group, project, group)
+            for project in projects
+            for group in project.sim_groups()
+        ]
+        for future in futures:
+            future.result()
+
+
+def timing_summary(projects: list[Project], wall_time: float) -> str:
+    """per-project timing table"""
+    lines = [f"{'project':<14}{'sims':>6}{'failed':>8}{'sim sec':>10}{'wall sec':>10}"]
+    for project in projects:
+        lines.append(
+            f"{project.name:<14}{len(project.sim_times):>6}"
+            f"{len(project.failures):>8}{sum(project.sim_times):>10.2f}"
+            f"{project.end - project.start:>10.2f}"
+        )
+    lines.append(f"total wall time: {wall_time:.2f} sec")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """command line entry point"""
+    parser = argparse.ArgumentParser(
+        prog="py4spice",
+        description="Run the ngspice simulations of projects in a config file",
+    )
+    parser.add_argument(
+        "projects",
+        nargs="*",
+        help='project sections to run, or "all" (default: GLOBAL PROJECT)',
+    )
+    parser.add_argument(
+        "-c", "--config", type=Path, default=DEFAULT_CONFIG, help="config file"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="simulations run in parallel"
+    )
+    parser.add_argument(
+        "-l", "--list", action="store_true", help="list projects and exit"
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.config, "rb") as file:
+        config: dict[str, Any] = tomllib.load(file)
+    all_names = [name for name in config if name != Key.GLOBAL]
+
+    if args.list:
+        print("\n".join(all_names))
+        return 0
+
+    names: list[str] = args.projects or [config[Key.GLOBAL][Key.PROJECT]]
+    if "all" in names:
+        names = all_names
+    unknown = [name for name in names if name not in all_names]
+    if unknown:
+        parser.error(f"unknown project(s): {', '.join(unknown)}")
+
+    projects = [Project(name, config) for name in names]
+    start = time.perf_counter()
+    run_projects(projects, args.jobs)
+    print(timing_summary(projects, time.perf_counter() - start))
+
+    for project in projects:
+        for failure in project.failures:
+            print(f"{project.name}: {failure}")
+    return 1 if any(project.failures for project in projects) else 0
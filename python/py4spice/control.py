@@ -3,6 +3,8 @@
 import time
 from pathlib import Path
 
+from .vectors import Vectors
+
 
 class Control:
     """Generate Control file"""
@@ -42,6 +44,17 @@ class Control:
         """
         self.middle.extend(lines)
 
+    def save_vectors(self, vectors: Vectors) -> None:
+        """Limit the vectors ngspice keeps (and writes) with a 'save' command,
+        placed before the analyses. No effect for "all".
+
+        Args:
+            vectors (Vectors): vectors to keep, e.g. the sum of the analyses'
+        """
+        save_line = vectors.save_line()
+        if save_line:
+            self.beginning.append(save_line)
+
     def content_to_file(self, cntl_filename: Path) -> None:
         """write content to file"""
         content: list[str] = self.beginning + self.middle + self.ending
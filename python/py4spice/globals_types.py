@@ -16,3 +16,26 @@ PLOT_DATA: list[AnaType] = ["ac", "dc", "disto", "noise", "pz", "sp", "tran"]
 TIME_AXIS: list[AnaType] = ["tran"]
 SIG_AXIS: list[AnaType] = ["dc"]
 FREQ_AXIS: list[AnaType] = ["ac", "noise"]
+
+
+class Key:
+    """Keys for the config file and the paths_dict, so they can be referenced
+    instead of using strings for keys. A notebook subclasses it to add the keys
+    of its own netlists_dict and vectors_dict.
+    """
+
+    # Keys for decoding config file
+    GLOBAL: str = "GLOBAL"
+    PROJECT: str = "PROJECT"
+    NGSPICE_EXE_STR: str = "NGSPICE_EXE_STR"
+    NETLISTS_DIR_STR: str = "NETLISTS_DIR_STR"
+    RESULTS_DIR_STR: str = "RESULTS_DIR_STR"
+    SIM_TRANSCRIPT_STR: str = "SIM_TRANSCRIPT_STR"
+    PROJ_PATH_STR: str = "PROJ_PATH_STR"
+
+    # Keys for the paths_dict
+    NGSPICE_EXE = "ngspice_exe"
+    PROJ_PATH = "proj_path"
+    NETLISTS_PATH = "netlists_path"
+    RESULTS_PATH = "results_path"
+    SIM_TRANSCRIPT_FILENAME = "sim_transcript_filename"
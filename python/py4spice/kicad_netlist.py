@@ -1,31 +1,58 @@
 """initialize and run Kicad cmd"""
+import hashlib
+import os
+import re
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from subprocess import CompletedProcess
 from pathlib import Path
+from typing import Optional
+
+from .netlist import Netlist
+
+# sub-sheet reference in a .kicad_sch file, e.g. (property "Sheetfile" "pwr.kicad_sch"
+SHEET_FILE_RE = re.compile(rb'\(property\s+"Sheet ?[Ff]ile"\s+"([^"]+)"')
 
 
 class KicadNetlist:
-    """KiCad netlist export command"""
+    """KiCad netlist export command.
+
+    Exports are cached on a hash of the schematic and all its hierarchical
+    sheets, so kicad-cli only runs when one of them changed.
+    """
 
     def __init__(
-        self, kicad_cmd: Path, sch_filename: Path, netlist_filename: Path
+        self,
+        kicad_cmd: Path,
+        sch_filename: Path,
+        netlist_filename: Path,
+        cache_dir: Optional[Path] = None,
     ) -> None:
         self.kicad_cmd: Path = kicad_cmd  # Path to the KiCad executable
         self.sch_filename: Path = sch_filename
         self.netlist_filename: Path = netlist_filename
+        self.cache_dir: Path = (
+            cache_dir if cache_dir is not None else netlist_filename.parent / ".kicad"
+        )
 
         # construct the command
-        self.cmd_args: list[str] = [f"{self.kicad_cmd}"]
-        self.cmd_args.append("sch")
-        self.cmd_args.append("export")
-        self.cmd_args.append("netlist")
-        self.cmd_args.append("--output")
-        self.cmd_args.append(f"{self.netlist_filename}")
-        self.cmd_args.append("--format")
-        self.cmd_args.append("spice")
-        self.cmd_args.append(f"{self.sch_filename}")
+        self.cmd_args: list[str] = self._cmd_args(self.netlist_filename)
         self.cmd: str = " ".join(str(item) for item in self.cmd_args)
 
+    def _cmd_args(self, output_filename: Path) -> list[str]:
+        """kicad-cli arguments to export the netlist to output_filename"""
+        cmd_args: list[str] = [f"{self.kicad_cmd}"]
+        cmd_args.append("sch")
+        cmd_args.append("export")
+        cmd_args.append("netlist")
+        cmd_args.append("--output")
+        cmd_args.append(f"{output_filename}")
+        cmd_args.append("--format")
+        cmd_args.append("spice")
+        cmd_args.append(f"{self.sch_filename}")
+        return cmd_args
+
     def __str__(self) -> str:
         """print out the constructed KiCad cmd
 
@@ -34,6 +61,83 @@ class KicadNetlist:
         """
         return self.cmd
 
+    def sch_files(self) -> list[Path]:
+        """The top schematic and all its hierarchical sheets"""
+        found: list[Path] = []
+        to_visit: list[Path] = [self.sch_filename]
+        while to_visit:
+            sch = to_visit.pop()
+            if sch in found or not sch.exists():
+                continue
+            found.append(sch)
+            for sub_sheet in SHEET_FILE_RE.findall(sch.read_bytes()):
+                to_visit.append(sch.parent / sub_sheet.decode())
+        return found
+
+    @property
+    def sch_hash(self) -> str:
+        """hash of the schematic files (and kicad-cli used to export them)"""
+        sha = hashlib.sha256(str(self.kicad_cmd).encode())
+        for sch in sorted(self.sch_files()):
+            sha.update(os.path.relpath(sch, self.sch_filename.parent).encode())
+            sha.update(sch.read_bytes())
+        return sha.hexdigest()
+
+    @property
+    def cached_filename(self) -> Path:
+        """cached export for the current state of the schematic"""
+        return self.cache_dir / f"{self.sch_hash}.cir"
+
+    def export(self) -> tuple[Path, CompletedProcess[bytes]]:
+        """Export to the cache, unless the schematic is unchanged
+
+        Returns:
+            tuple[Path, CompletedProcess[bytes]]: cached netlist and kicad result
+                (returncode 0 without running kicad-cli on a cache hit)
+        """
+        cached: Path = self.cached_filename
+        if cached.exists():
+            return cached, CompletedProcess(self._cmd_args(cached), 0)
+
+        # export to a temporary name, so a partial file is never used as cache
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_filename = cached.with_suffix(tmp_suffix)
+        completed = subprocess.run(self._cmd_args(tmp_filename), check=False)
+        if completed.returncode == 0 and tmp_filename.exists():
+            os.replace(tmp_filename, cached)
+        return cached, completed
+
     def run(self) -> CompletedProcess[bytes]:
-        """execute the kicad cmd"""
-        return subprocess.run(self.cmd_args, check=False)
+        """execute the kicad cmd, or reuse the cached export, and write the
+        netlist file"""
+        cached, completed = self.export()
+        if completed.returncode == 0 and cached.exists():
+            self.netlist_filename.write_bytes(cached.read_bytes())
+        return completed
+
+    def netlist(self) -> Netlist:
+        """Export (if the schematic changed) and parse straight into a Netlist,
+        without writing the netlist file"""
+        cached, completed = self.export()
+        if completed.returncode != 0 or not cached.exists():
+            raise RuntimeError(f"Error: KiCad netlist export failed: {self.cmd}")
+        return Netlist(cached)
+
+
+def export_netlists(
+    kicad_netlists: list[KicadNetlist], max_workers: Optional[int] = None
+) -> list[Netlist]:
+    """Export several schematics concurrently and parse them into Netlists.
+    Unchanged schematics come from the cache without running kicad-cli.
+
+    Args:
+        kicad_netlists (list[KicadNetlist]): schematics to export
+        max_workers (Optional[int]): concurrent kicad-cli processes
+
+    Returns:
+        list[Netlist]: netlists, in the order of kicad_netlists
+    """
+    # kicad-cli runs in its own process, so threads are enough to overlap them
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(KicadNetlist.netlist, kicad_netlists))
@@ -1,6 +1,24 @@
 from pathlib import Path
 from typing import Optional
 
+# number of nodes of each element type (first letter), 2 if not listed
+NODE_COUNTS: dict[str, int] = {
+    "k": 0,  # coupled inductors
+    "q": 3,
+    "j": 3,
+    "z": 3,  # mesfet
+    "u": 3,  # uniform rc line
+    "m": 4,
+    "e": 4,
+    "g": 4,
+    "s": 4,  # voltage controlled switch
+    "t": 4,
+    "o": 4,  # lossy transmission line
+}
+
+# element types with a branch current vector (name#branch in ngspice)
+BRANCH_ELEMENTS: set[str] = {"v", "l", "e", "h"}
+
 
 class Netlist:
     """Manipulates SPICE netlists"""
@@ -52,3 +70,61 @@ class Netlist:
         self.data = [
             line.replace("/", "") if line[0].isalpha() else line for line in self.data
         ]
+
+    def _element_lines(self) -> list[list[str]]:
+        """words of each top-level element line (continuation lines joined,
+        comments, dot commands, subcircuit contents and control sections
+        skipped)"""
+        elements: list[list[str]] = []
+        in_subckt = False
+        in_control = False
+        for line in self.data:
+            words = line.split()
+            if not words or words[0].startswith("*"):
+                continue
+            if words[0] == ".subckt":
+                in_subckt = True
+            elif words[0] == ".ends":
+                in_subckt = False
+            elif words[0] == ".control":
+                in_control = True
+            elif words[0] == ".endc":
+                in_control = False
+            elif in_subckt or in_control:
+                continue
+            elif words[0].startswith("+"):
+                if elements:
+                    elements[-1].extend(line.lstrip()[1:].split())
+            elif words[0][0].isalpha():
+                elements.append(words)
+        return elements
+
+    def nodes(self) -> list[str]:
+        """Top-level node names, in netlist order (ground "0" excluded)"""
+        found: dict[str, None] = {}
+        for words in self._element_lines():
+            kind = words[0][0]
+            # nodes end before the first parameter, expression or function,
+            # e.g. "e1 out 0 value={...}" or "b1 out 0 v=v(in)" or "poly(2)"
+            end = len(words)
+            for i, word in enumerate(words[1:], start=1):
+                if "=" in word or "(" in word or word == "params:":
+                    end = i
+                    break
+            if kind == "x":  # subckt call: nodes, then subckt name
+                connections = words[1:end][:-1]
+            else:
+                last = 1 + NODE_COUNTS.get(kind, 2)
+                connections = words[1:min(last, end)]
+            for node in connections:
+                if node != "0" and node not in found:
+                    found[node] = None
+        return list(found)
+
+    def branch_currents(self) -> list[str]:
+        """Branch current vectors, as i(name), of the elements that have them"""
+        return [
+            f"i({words[0]})"
+            for words in self._element_lines()
+            if words[0][0] in BRANCH_ELEMENTS
+        ]
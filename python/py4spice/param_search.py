@@ -0,0 +1,234 @@
+"""Search a circuit parameter for a metric target with few simulations"""
+
+import itertools
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from .analyses import Analyses
+from .control import Control
+from .netlist import NODE_COUNTS, Netlist
+from .sim_results import SimResults
+from .simulate import Simulate
+
+
+def _param_re(name: str) -> re.Pattern[str]:
+    """name=value in a .param line (value a word or a {expression})"""
+    return re.compile(rf"(?<![\w.])({re.escape(name)}\s*=\s*)(\{{[^}}]*\}}|\S+)")
+
+
+def with_value(netlist: Netlist, name: str, value: float) -> Netlist:
+    """Copy of netlist with a new value for name.
+
+    If name is an element (a line starts with it, e.g. "cout out 0 100u ic=0")
+    the value word after its nodes is replaced (after "dc" for a source).
+    Otherwise name is a parameter: its ".param name=..." definition is changed,
+    or ".param name=value" is added after the title line if there is none.
+    """
+    new_netlist = Netlist("\n".join(netlist.data))
+    name = name.lower()
+    new_value = f"{value:.12g}"
+    index = new_netlist.line_starts_with(f"{name} ")
+    if index != -1:
+        words = new_netlist.data[index].split()
+        pos = 1 + NODE_COUNTS.get(name[0], 2)
+        if name[0] in "vi" and pos < len(words) and words[pos] == "dc":
+            pos += 1
+        if pos >= len(words) or "=" in words[pos] or "(" in words[pos]:
+            raise ValueError(
+                f"Error: no plain value to replace in '{new_netlist.data[index]}'"
+            )
+        words[pos] = new_value
+        new_netlist.data[index] = " ".join(words)
+        return new_netlist
+
+    param_re = _param_re(name)
+    for i, line in enumerate(new_netlist.data):
+        if line.startswith(".param") and param_re.search(line):
+            new_netlist.data[i] = param_re.sub(rf"\g<1>{new_value}", line)
+            return new_netlist
+    new_netlist.insert_line(1, f".param {name}={new_value}")
+    return new_netlist
+
+
+class ParamSearch:
+    """Find the parameter value where a scalar metric of the simulation results
+    reaches a target, running several probe simulations in parallel per round.
+
+    The circuit netlist has no control section or .end; each probe gets its own
+    control section and result file, so probes can run at the same time.
+    """
+
+    def __init__(
+        self,
+        ngspice_exe: Path,
+        circuit: Netlist,
+        analysis: Analyses,
+        param: str,
+        metric: Callable[[SimResults], float],
+        work_path: Path,
+        timeout: int = 20,
+    ) -> None:
+        self.ngspice_exe: Path = ngspice_exe
+        self.circuit: Netlist = circuit
+        self.analysis: Analyses = analysis
+        self.param: str = param
+        self.metric: Callable[[SimResults], float] = metric
+        self.work_path: Path = work_path
+        self.timeout: int = timeout
+        self.transcript_filename: Path = work_path / "search_transcript.log"
+        self.history: dict[float, float] = {}  # param value -> metric
+        self._probe_ids = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def sim_count(self) -> int:
+        """number of ngspice runs so far"""
+        return len(self.history)
+
+    def _probe(self, value: float) -> float:
+        """simulate the circuit at one parameter value and return the metric"""
+        with self._lock:
+            probe_id = next(self._probe_ids)
+        name = f"{self.analysis.name}_probe{probe_id}"
+        probe_analysis = Analyses(
+            name,
+            self.analysis.cmd_type,
+            self.analysis.cmd,
+            self.analysis.vector,
+            self.work_path,
+        )
+        control = Control()
+        control.insert_lines(probe_analysis.lines_for_cntl())
+        # control not passed through Netlist, which would lowercase the paths
+        circuit = with_value(self.circuit, self.param, value)
+        netlist_filename = self.work_path / f"{name}.cir"
+        netlist_filename.write_text(f"{circuit}\n{control}\n.end\n")
+
+        sim = Simulate(
+            self.ngspice_exe,
+            netlist_filename,
+            self.transcript_filename,
+            name,
+            self.timeout,
+        )
+        sim.run()
+        results = SimResults.from_file(
+            probe_analysis.cmd_type, probe_analysis.results_filename
+        )
+        return float(self.metric(results))
+
+    def evaluate(self, values: list[float]) -> list[float]:
+        """Metric at each value; new values are simulated in parallel"""
+        self.work_path.mkdir(parents=True, exist_ok=True)
+        new_values = [
+            value for value in dict.fromkeys(values) if value not in self.history
+        ]
+        if new_values:
+            with ThreadPoolExecutor(max_workers=len(new_values)) as executor:
+                metrics = list(executor.map(self._probe, new_values))
+            self.history.update(zip(new_values, metrics))
+        return [self.history[value] for value in values]
+
+    @staticmethod
+    def _split(lo: float, hi: float, probes: int, log_scale: bool) -> list[float]:
+        """probes points evenly inside (lo, hi)"""
+        if log_scale:
+            return np.geomspace(lo, hi, probes + 2)[1:-1].tolist()
+        return np.linspace(lo, hi, probes + 2)[1:-1].tolist()
+
+    def threshold(
+        self,
+        target: float,
+        lo: float,
+        hi: float,
+        xtol: float,
+        probes: int = 3,
+        log_scale: bool = False,
+        max_rounds: int = 50,
+    ) -> float:
+        """Parameter value where the metric crosses target (metric monotonic in
+        [lo, hi]). Each round simulates probes points in parallel and shrinks
+        the bracket by probes + 1 (bisection when probes = 1).
+
+        Args:
+            target (float): metric value to find
+            lo (float): low end of the search range
+            hi (float): high end of the search range
+            xtol (float): stop when the bracket is narrower than this
+            probes (int): parallel simulations per round
+            log_scale (bool): split the bracket geometrically (e.g. capacitors)
+            max_rounds (int): limit on the number of rounds
+
+        Returns:
+            float: parameter value at the crossing (linear interpolation)
+        """
+        metric_lo, metric_hi = self.evaluate([lo, hi])
+        if (metric_lo - target) * (metric_hi - target) > 0:
+            raise ValueError(
+                f"Error: metric does not cross {target} between {lo} and {hi}"
+            )
+
+        for _ in range(max_rounds):
+            if hi - lo <= xtol:
+                break
+            points = self._split(lo, hi, probes, log_scale)
+            values = [lo] + points + [hi]
+            metrics = [metric_lo] + self.evaluate(points) + [metric_hi]
+
+            # first sub-interval where metric - target changes sign
+            for i in range(len(values) - 1):
+                if (metrics[i] - target) * (metrics[i + 1] - target) <= 0:
+                    lo, hi = values[i], values[i + 1]
+                    metric_lo, metric_hi = metrics[i], metrics[i + 1]
+                    break
+
+        if metric_hi == metric_lo:
+            return lo
+        return lo + (target - metric_lo) * (hi - lo) / (metric_hi - metric_lo)
+
+    def minimize(
+        self,
+        lo: float,
+        hi: float,
+        xtol: float,
+        probes: int = 4,
+        log_scale: bool = False,
+        max_rounds: int = 50,
+        objective: Optional[Callable[[float], float]] = None,
+    ) -> float:
+        """Parameter value that minimizes the metric (unimodal in [lo, hi]).
+        Golden-section style bracket refinement, with probes points simulated in
+        parallel per round. objective maps the metric to what is minimized
+        (e.g. lambda m: abs(m - target), or lambda m: -m to maximize).
+
+        Returns:
+            float: best parameter value found
+        """
+        if probes < 2:
+            raise ValueError("Error: minimize needs at least 2 probes per round")
+
+        def score(metric: float) -> float:
+            return objective(metric) if objective is not None else metric
+
+        for _ in range(max_rounds):
+            if hi - lo <= xtol:
+                break
+            points = self._split(lo, hi, probes, log_scale)
+            values = [lo] + points + [hi]
+            scores = [score(metric) for metric in self.evaluate(points)]
+
+            # keep the neighbors of the best interior point as the new bracket
+            best = int(np.argmin(scores)) + 1
+            lo, hi = values[best - 1], values[best + 1]
+
+        best_value = min(
+            (value for value in self.history if lo <= value <= hi),
+            key=lambda value: score(self.history[value]),
+            default=(lo + hi) / 2,
+        )
+        return best_value
@@ -1,7 +1,10 @@
 """Line plot multiple pd.DataFrame results from simulation
 """
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional, Literal
+import matplotlib as mpl
 import matplotlib.figure as fig
 import matplotlib.pyplot as plt
 from cycler import cycler
@@ -15,47 +18,52 @@ Scale = Literal["linear", "log"]
 FIG_SIZE: tuple[float, float] = (16, 8)
 
 
-def oscilloscope_colors() -> None:
-    """Set style properties to look like dark oscilloscope screen"""
-
-    plt.rcParams["lines.color"] = "#d8b200"
-    plt.rcParams["patch.edgecolor"] = "#d8b200"
-
-    plt.rcParams["text.color"] = "#d8b200"
-
-    plt.rcParams["axes.facecolor"] = "black"
-    plt.rcParams["axes.edgecolor"] = "#d8b200"
-    plt.rcParams["axes.labelcolor"] = "#d8b200"
-
-    plt.rcParams["axes.prop_cycle"] = cycler(
-        color=["#00FF00", "#00ffff", "#ff00ff", "#ffd200"]
-    )
+# style properties to look like dark oscilloscope screen
+OSCILLOSCOPE_STYLE: mpl.RcParams = mpl.RcParams(
+    {
+        "lines.color": "#d8b200",
+        "patch.edgecolor": "#d8b200",
+        "text.color": "#d8b200",
+        "axes.facecolor": "black",
+        "axes.edgecolor": "#d8b200",
+        "axes.labelcolor": "#d8b200",
+        "axes.prop_cycle": cycler(color=["#00FF00", "#00ffff", "#ff00ff", "#ffd200"]),
+        "axes.grid": True,
+        "axes.grid.axis": "both",
+        "grid.linestyle": "dotted",
+        "xtick.minor.visible": True,
+        "ytick.minor.visible": True,
+        "xtick.color": "#d8b200",
+        "ytick.color": "#d8b200",
+        "grid.color": "#d8b200",
+        "figure.facecolor": "#282828",
+        "figure.edgecolor": "black",
+        "savefig.facecolor": "black",
+        "savefig.edgecolor": "black",
+        "legend.edgecolor": "#d8b200",
+        "legend.facecolor": "#282828",
+        "boxplot.boxprops.color": "white",
+        "boxplot.capprops.color": "white",
+        "boxplot.flierprops.color": "white",
+        "boxplot.flierprops.markeredgecolor": "white",
+        "boxplot.whiskerprops.color": "white",
+    }
+)
 
-    plt.rcParams["axes.grid"] = True
-    plt.rcParams["axes.grid.axis"] = "both"
-    plt.rcParams["grid.linestyle"] = "dotted"
-    plt.rcParams["xtick.minor.visible"] = True
-    plt.rcParams["ytick.minor.visible"] = True
 
-    plt.rcParams["xtick.color"] = "#d8b200"
-    plt.rcParams["ytick.color"] = "#d8b200"
-
-    plt.rcParams["grid.color"] = "#d8b200"
-
-    plt.rcParams["figure.facecolor"] = "#282828"
-    plt.rcParams["figure.edgecolor"] = "black"
+def oscilloscope_colors() -> None:
+    """Set style properties (globally) to look like dark oscilloscope screen"""
+    plt.rcParams.update(OSCILLOSCOPE_STYLE)
 
-    plt.rcParams["savefig.facecolor"] = "black"
-    plt.rcParams["savefig.edgecolor"] = "black"
 
-    plt.rcParams["legend.edgecolor"] = "#d8b200"
-    plt.rcParams["legend.facecolor"] = "#282828"
+def _draw_lines(
+    axe: plt.Axes, x_data: numpy_flt, y_data: list[numpy_flt], y_names: list[str]
+) -> None:
+    """Draw the signals and legend on an axes"""
+    for index, y_array in enumerate(y_data):
+        axe.plot(x_data, y_array, label=y_names[index])
 
-    plt.rcParams["boxplot.boxprops.color"] = "white"
-    plt.rcParams["boxplot.capprops.color"] = "white"
-    plt.rcParams["boxplot.flierprops.color"] = "white"
-    plt.rcParams["boxplot.flierprops.markeredgecolor"] = "white"
-    plt.rcParams["boxplot.whiskerprops.color"] = "white"
+    axe.legend(title="Signals:")
 
 
 def create_plot(
@@ -63,16 +71,10 @@ def create_plot(
 ) -> tuple[fig.Figure, plt.Axes]:
     """Create line plot from simulation results"""
 
-    # set style to look like an oscilloscope
-    oscilloscope_colors()
-
-    fig_axe: tuple[fig.Figure, plt.Axes] = plt.subplots(figsize=FIG_SIZE)
-    axe: plt.Axes = fig_axe[1]
-
-    for index, y_array in enumerate(y_data):
-        axe.plot(x_data, y_array, label=y_names[index])
-
-    plt.legend(title="Signals:")
+    # style to look like an oscilloscope, without changing global rcParams
+    with mpl.rc_context(OSCILLOSCOPE_STYLE):
+        fig_axe: tuple[fig.Figure, plt.Axes] = plt.subplots(figsize=FIG_SIZE)
+        _draw_lines(fig_axe[1], x_data, y_data, y_names)
 
     return fig_axe
 
@@ -86,20 +88,32 @@ class Plot:
         signals: list[numpy_flt],
         sig_names: list[str],
         results_path: Path,
+        figure: Optional[fig.Figure] = None,
     ) -> None:
         self.name = name
         self.signals = signals
         self.sig_names = sig_names
         self.results_path: Path = results_path
 
-        # create initial plot
-        self.fig_axe = create_plot(self.signals[0], self.signals[1:], self.sig_names)
+        # create initial plot. Reuse figure if given (headless, no pyplot)
+        if figure is None:
+            self.fig_axe = create_plot(
+                self.signals[0], self.signals[1:], self.sig_names
+            )
+        else:
+            figure.clear()
+            with mpl.rc_context(OSCILLOSCOPE_STYLE):
+                figure.set_facecolor(OSCILLOSCOPE_STYLE["figure.facecolor"])
+                axe: plt.Axes = figure.add_subplot()
+                _draw_lines(axe, self.signals[0], self.signals[1:], self.sig_names)
+            self.fig_axe = (figure, axe)
         self.fig: fig.Figure = self.fig_axe[0]
         self.axe: plt.Axes = self.fig_axe[1]
 
     def set_title(self, title: str) -> None:
         """title for plot"""
-        self.axe.set_title(title)
+        with mpl.rc_context(OSCILLOSCOPE_STYLE):
+            self.axe.set_title(title)
 
     def define_axes(
         self, x_info: tuple[str, str, Scale], y_info: tuple[str, str, Scale]
@@ -121,10 +135,11 @@ class Plot:
         if y_scale not in ["linear", "log"]:
             y_scale = "linear"
 
-        self.axe.set_xlabel(f"{x_measure} ({x_units})")
-        self.axe.set_ylabel(f"{y_measure} ({y_units})")
-        self.axe.set_xscale(x_scale)
-        self.axe.set_yscale(y_scale)
+        with mpl.rc_context(OSCILLOSCOPE_STYLE):
+            self.axe.set_xlabel(f"{x_measure} ({x_units})")
+            self.axe.set_ylabel(f"{y_measure} ({y_units})")
+            self.axe.set_xscale(x_scale)
+            self.axe.set_yscale(y_scale)
 
     def zoom(
         self,
@@ -147,7 +162,12 @@ class Plot:
     def png(self) -> None:
         """Create a png of the plot and store in the "results_loc" dir"""
         plot_filename: Path = self.results_path / f"{self.name}.png"
-        self.fig.savefig(str(plot_filename))
+        with mpl.rc_context(OSCILLOSCOPE_STYLE):
+            self.fig.savefig(str(plot_filename))
+
+    def close(self) -> None:
+        """Release the figure, so memory does not grow over many plots"""
+        plt.close(self.fig)
 
 
 def display_plots() -> None:
@@ -156,3 +176,79 @@ def display_plots() -> None:
     from the png's which are saved with a different method.
     """
     plt.show()
+
+
+class PlotSpec:
+    """Everything needed to render one Plot to png, so it can be sent to a worker
+    process"""
+
+    def __init__(
+        self,
+        name: str,
+        signals: list[numpy_flt],
+        sig_names: list[str],
+        results_path: Path,
+        title: str = "",
+        x_info: Optional[tuple[str, str, Scale]] = None,
+        y_info: Optional[tuple[str, str, Scale]] = None,
+        limits: Optional[dict[str, int | float]] = None,
+    ) -> None:
+        self.name = name
+        self.signals = signals
+        self.sig_names = sig_names
+        self.results_path: Path = results_path
+        self.title = title
+        self.x_info = x_info
+        self.y_info = y_info
+        self.limits: dict[str, int | float] = limits or {}  # zoom() keywords
+
+
+# figure reused by all plots rendered in one worker process
+_worker_figure: Optional[fig.Figure] = None
+
+
+def _init_worker() -> None:
+    """Worker processes render headless, on the Agg backend"""
+    mpl.use("Agg")
+
+
+def render_png(spec: PlotSpec) -> Path:
+    """Render a PlotSpec to png on a reusable, pyplot-free figure
+
+    Returns:
+        Path: the png file
+    """
+    global _worker_figure
+    if _worker_figure is None:
+        _worker_figure = fig.Figure(figsize=FIG_SIZE)
+
+    my_plt = Plot(
+        spec.name, spec.signals, spec.sig_names, spec.results_path, _worker_figure
+    )
+    if spec.title:
+        my_plt.set_title(spec.title)
+    if spec.x_info is not None and spec.y_info is not None:
+        my_plt.define_axes(spec.x_info, spec.y_info)
+    my_plt.zoom(**spec.limits)
+    my_plt.png()
+    _worker_figure.clear()  # drop the lines, keep the figure
+    return spec.results_path / f"{spec.name}.png"
+
+
+def render_pngs(specs: list[PlotSpec], max_workers: Optional[int] = None) -> list[Path]:
+    """Render many plots to png in parallel worker processes (Agg backend).
+    Each worker reuses one figure, so memory stays bounded.
+
+    Args:
+        specs (list[PlotSpec]): plots to render
+        max_workers (Optional[int]): number of processes, default: cpu count
+
+    Returns:
+        list[Path]: png files, in the order of specs
+    """
+    # "spawn" so workers do not inherit the caller's pyplot/GUI state
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=context, initializer=_init_worker
+    ) as executor:
+        return list(executor.map(render_png, specs))
@@ -0,0 +1,254 @@
+"""Compare simulation results against saved golden (reference) results"""
+
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from scipy.interpolate import interp1d  # type: ignore
+
+from .globals_types import TABLE_DATA, numpy_flt
+from .sim_results import SimResults
+
+
+def vec_checksums(results: SimResults) -> dict[str, str]:
+    """Checksum of each vector (plot column or table entry)"""
+    checksums: dict[str, str] = {}
+    if results.analysis_type in TABLE_DATA:
+        for key, value in results.data_table.items():
+            checksums[key] = hashlib.blake2b(
+                np.float64(value).tobytes(), digest_size=16
+            ).hexdigest()
+        return checksums
+
+    for i, name in enumerate(results.header):
+        column = np.ascontiguousarray(results.data_plot[:, i], dtype=np.float64)
+        checksums[name] = hashlib.blake2b(column.tobytes(), digest_size=16).hexdigest()
+    return checksums
+
+
+def save_golden(results: SimResults, filename: Path) -> None:
+    """Save results (and their checksums) as a golden reference .npz file"""
+    checksums = vec_checksums(results)
+    np.savez(
+        filename,
+        analysis_type=np.array(results.analysis_type),
+        header=np.array(results.header, dtype=str),
+        data_plot=results.data_plot,
+        table_keys=np.array(list(results.data_table), dtype=str),
+        table_values=np.array(list(results.data_table.values()), dtype=float),
+        checksum_keys=np.array(list(checksums), dtype=str),
+        checksum_values=np.array(list(checksums.values()), dtype=str),
+    )
+
+
+def load_golden(filename: Path) -> tuple[SimResults, dict[str, str]]:
+    """Load a golden reference saved with save_golden
+
+    Returns:
+        tuple[SimResults, dict[str, str]]: results and their stored checksums
+    """
+    with np.load(filename) as npz:
+        table = dict(zip(npz["table_keys"].tolist(), npz["table_values"].tolist()))
+        results = SimResults(
+            str(npz["analysis_type"]),  # type: ignore[arg-type]
+            npz["header"].tolist(),
+            npz["data_plot"],
+            table,
+        )
+        checksums = dict(
+            zip(npz["checksum_keys"].tolist(), npz["checksum_values"].tolist())
+        )
+    return results, checksums
+
+
+class VecReport:
+    """Comparison result of one vector"""
+
+    def __init__(
+        self,
+        name: str,
+        passed: bool,
+        unchanged: bool = False,
+        worst_dev: float = 0.0,
+        worst_x: float = 0.0,
+        margin: float = 0.0,
+        note: str = "",
+    ) -> None:
+        self.name = name
+        self.passed = passed
+        self.unchanged = unchanged  # checksums matched, no comparison needed
+        self.worst_dev = worst_dev  # largest |new - golden|
+        self.worst_x = worst_x  # x where the envelope is exceeded most
+        self.margin = margin  # worst |new - golden| / tolerance (> 1: fail)
+        self.note = note  # why the vector could not be compared
+
+    def __str__(self) -> str:
+        status = "PASS" if self.passed else "FAIL"
+        if self.unchanged:
+            return f"{status}  {self.name}  (unchanged)"
+        if self.note:
+            return f"{status}  {self.name}  ({self.note})"
+        return (
+            f"{status}  {self.name}  worst dev {self.worst_dev:.3g} "
+            f"at x={self.worst_x:.3g}  ({self.margin:.2f}x tol)"
+        )
+
+
+class RegressionReport:
+    """Pass/fail report of new results against a golden reference"""
+
+    def __init__(self, name: str, vec_reports: list[VecReport]) -> None:
+        self.name = name
+        self.vec_reports = vec_reports
+
+    @property
+    def passed(self) -> bool:
+        """True if every vector passed"""
+        return all(report.passed for report in self.vec_reports)
+
+    @property
+    def failures(self) -> list[VecReport]:
+        """vectors that failed"""
+        return [report for report in self.vec_reports if not report.passed]
+
+    def __str__(self) -> str:
+        status = "PASS" if self.passed else "FAIL"
+        unchanged = sum(report.unchanged for report in self.vec_reports)
+        lines = [
+            f"{status}  {self.name}: {len(self.vec_reports)} vectors, "
+            f"{unchanged} unchanged, {len(self.failures)} failed"
+        ]
+        lines.extend(f"  {report}" for report in self.failures)
+        return "\n".join(lines)
+
+
+def _compare_table(
+    new: SimResults,
+    names: list[str],
+    golden: SimResults,
+    rtol: float,
+    atol: float,
+) -> list[VecReport]:
+    """compare table entries, all at once"""
+    new_vals = np.array([new.data_table[name] for name in names])
+    gold_vals = np.array([golden.data_table[name] for name in names])
+    dev = np.abs(new_vals - gold_vals)
+    margin = (dev / (atol + rtol * np.abs(gold_vals))).tolist()
+    return [
+        VecReport(name, bool(margin[i] <= 1), False, float(dev[i]), 0.0, margin[i])
+        for i, name in enumerate(names)
+    ]
+
+
+def _compare_plot(
+    new: SimResults,
+    names: list[str],
+    golden: SimResults,
+    rtol: float,
+    atol: float,
+    same_x: bool,
+) -> list[VecReport]:
+    """compare plot columns on the golden x-axis, all columns at once"""
+    new_cols = [new.header.index(name) for name in names]
+    gold_cols = [golden.header.index(name) for name in names]
+    x_gold: numpy_flt = golden.data_plot[:, 0]
+    gold: numpy_flt = golden.data_plot[:, gold_cols]
+    if len(x_gold) == 0 or len(new.data_plot) == 0:
+        return [VecReport(name, False, note="no points") for name in names]
+
+    if same_x:
+        new_aligned: numpy_flt = new.data_plot[:, new_cols]
+    else:
+        # interpolate new results onto the golden x points. A new run that
+        # does not span the golden x range (e.g. stopped early) fails every
+        # vector, rather than being compared on the overlap only
+        x_new: numpy_flt = new.data_plot[:, 0]
+        x_lo, x_hi = float(x_new.min()), float(x_new.max())
+        slack = 1e-9 * (x_hi - x_lo)  # x rounding in the results files
+        gold_lo, gold_hi = float(x_gold.min()), float(x_gold.max())
+        if gold_lo < x_lo - slack or gold_hi > x_hi + slack:
+            note = (
+                f"x range {x_lo:.3g}..{x_hi:.3g} does not cover "
+                f"golden {gold_lo:.3g}..{gold_hi:.3g}"
+            )
+            return [VecReport(name, False, note=note) for name in names]
+        funct = interp1d(x_new, new.data_plot[:, new_cols], axis=0)
+        new_aligned = funct(np.clip(x_gold, x_lo, x_hi))
+
+    dev = np.abs(new_aligned - gold)
+    margin = dev / (atol + rtol * np.abs(gold))  # tolerance envelope
+    worst = np.argmax(margin, axis=0)
+    cols = np.arange(len(names))
+    worst_margin = margin[worst, cols]
+    return [
+        VecReport(
+            name,
+            bool(worst_margin[i] <= 1),
+            False,
+            float(dev[:, i].max()),
+            float(x_gold[worst[i]]),
+            float(worst_margin[i]),
+        )
+        for i, name in enumerate(names)
+    ]
+
+
+def compare_results(
+    new: SimResults,
+    golden: SimResults,
+    name: str = "",
+    rtol: float = 1e-3,
+    atol: float = 1e-9,
+    golden_checksums: Optional[dict[str, str]] = None,
+) -> RegressionReport:
+    """Compare new results against golden results, vector by vector.
+
+    A vector passes if |new - golden| <= atol + rtol * |golden| at every point.
+    Vectors with matching checksums pass without being compared. Plot vectors
+    fail if the new x range does not cover the golden x range.
+
+    Args:
+        new (SimResults): results of the current simulation
+        golden (SimResults): reference results
+        name (str): name for the report
+        rtol (float): relative tolerance
+        atol (float): absolute tolerance
+        golden_checksums (Optional[dict[str, str]]): stored checksums of golden
+
+    Returns:
+        RegressionReport: pass/fail of every vector
+    """
+    if new.analysis_type != golden.analysis_type:
+        raise ValueError(
+            f"Error: cannot compare {new.analysis_type} with {golden.analysis_type}"
+        )
+    new_sums = vec_checksums(new)
+    gold_sums = golden_checksums or vec_checksums(golden)
+
+    # vectors in golden but missing from the new results fail
+    reports = [
+        VecReport(vec, False, note="missing from new results")
+        for vec in gold_sums
+        if vec not in new_sums
+    ]
+    common = [vec for vec in gold_sums if vec in new_sums]
+    same_x = True
+
+    if new.analysis_type not in TABLE_DATA:
+        # x-axis is not a result itself, but if it moved every vector is compared
+        x_name = golden.header[0]
+        same_x = new_sums.get(x_name) == gold_sums.get(x_name)
+        common = [vec for vec in common if vec != x_name]
+
+    changed = [vec for vec in common if new_sums[vec] != gold_sums[vec] or not same_x]
+    reports.extend(
+        VecReport(vec, True, unchanged=True) for vec in common if vec not in changed
+    )
+
+    if changed and new.analysis_type in TABLE_DATA:
+        reports.extend(_compare_table(new, changed, golden, rtol, atol))
+    elif changed:
+        reports.extend(_compare_plot(new, changed, golden, rtol, atol, same_x))
+
+    return RegressionReport(name, reports)
@@ -1,12 +1,45 @@
 """Convert text file simulation results to objects"""
 
+import itertools
+import tracemalloc
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Iterator, Optional
 
 import numpy as np
-from matplotlib.ticker import EngFormatter
 
+from .arrow_io import plot_to_arrow, table_to_arrow, write_parquet
 from .globals_types import TABLE_DATA, AnaType, numpy_flt
 
+# text lines parsed at a time by the lean reader
+LEAN_CHUNK_ROWS: int = 65536
+
+
+class StagePeaks:
+    """Peak memory (bytes, from tracemalloc) of each processing stage"""
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.peaks: dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """measure the peak memory allocated while the block runs"""
+        if not self.enabled:
+            yield
+            return
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            self.peaks[name] = tracemalloc.get_traced_memory()[1] - base
+            if started:
+                tracemalloc.stop()
+
 
 class SimResults:
     """Create objects for results extracted from simulation text files.
@@ -25,6 +58,7 @@ class SimResults:
         self.header: list[str] = header
         self.data_plot: numpy_flt = data_plot
         self.data_table: dict[str, float] = data_table
+        self.mem_peaks: dict[str, int] = {}  # peak bytes per processing stage
 
     def __str__(self) -> str:
         string = f"analysis_type: {self.analysis_type}\n\n"
@@ -131,32 +165,144 @@ class SimResults:
 
         return header_without_dups, data_without_dups
 
+    @staticmethod
+    def _mag_phase_pairs(header_in: list[str]) -> tuple[list[str], list[int]]:
+        """Header after mag/phase conversion (see _mag_phase_convert), and the
+        index of the real column of each real/imaginary pair"""
+        header_out = header_in.copy()
+        pairs: list[int] = []
+        for i in range(len(header_out) - 1):
+            if header_out[i] == header_out[i + 1]:
+                header_out[i] += "-mag"
+                header_out[i + 1] += "-phase"
+                pairs.append(i)
+        return header_out, pairs
+
+    @staticmethod
+    def _mag_phase_in_place(data: numpy_flt, pairs: list[int]) -> None:
+        """Convert real/imaginary column pairs to magnitude and phase in place.
+        Only one column of temporary memory is used at a time."""
+        for i in pairs:
+            real_part = data[:, i]
+            imag_part = data[:, i + 1]
+            mag = np.hypot(real_part, imag_part)
+            np.arctan2(imag_part, real_part, out=imag_part)  # phase
+            np.degrees(imag_part, out=imag_part)
+            mag += 1e-20  # avoid log(0) error
+            np.log10(mag, out=mag)
+            np.multiply(mag, 20, out=real_part)
+
+    @staticmethod
+    def _load_columns(filename: Path, dtype: type, usecols: list[int]) -> numpy_flt:
+        """Parse the data lines into a column-major (Fortran order) array, one
+        chunk of lines at a time. Each vector is one contiguous block, so the
+        Arrow export does not copy it, and only one chunk is parsed into
+        temporary memory."""
+        with open(filename, "r", encoding="utf-8") as file:
+            file.readline()  # header
+            rows = sum(1 for line in file if line.strip())
+            data: numpy_flt = np.empty((rows, len(usecols)), dtype=dtype, order="F")
+            file.seek(0)
+            file.readline()
+            row = 0
+            while row < rows:
+                lines = itertools.islice(file, LEAN_CHUNK_ROWS)
+                chunk: numpy_flt = np.loadtxt(
+                    lines, dtype=dtype, usecols=usecols, ndmin=2
+                )
+                data[row:row + len(chunk)] = chunk
+                row += len(chunk)
+        return data
+
     @classmethod
-    def from_file(cls, analysis_type: AnaType, filename: Path) -> "SimResults":
+    def _from_file_lean(
+        cls,
+        analysis_type: AnaType,
+        filename: Path,
+        dtype: type,
+        peaks: StagePeaks,
+    ) -> "SimResults":
+        """from_file without copies: duplicate columns are never read, and the
+        mag/phase conversion is done in place"""
+        with peaks.stage("header"):
+            with open(filename, "r", encoding="utf-8") as file:
+                header_in = file.readline().split()
+            pairs: list[int] = []
+            header = header_in
+            if analysis_type in ["ac", "noise"]:
+                header, pairs = cls._mag_phase_pairs(header_in)
+            dups = set(cls._find_duplicate_indexes(header))
+            keep = [i for i in range(len(header)) if i not in dups]
+
+        with peaks.stage("parse"):
+            data = cls._load_columns(filename, dtype, keep)
+
+        with peaks.stage("mag_phase"):
+            # pair positions among the kept columns (duplicate pairs not read)
+            kept_pos = {col: pos for pos, col in enumerate(keep)}
+            kept_pairs = [kept_pos[i] for i in pairs if i in kept_pos]
+            cls._mag_phase_in_place(data, kept_pairs)
+
+        return cls(analysis_type, [header[i] for i in keep], data, {})
+
+    @classmethod
+    def from_file(
+        cls,
+        analysis_type: AnaType,
+        filename: Path,
+        lean: bool = False,
+        dtype: type = np.float64,
+        measure_memory: bool = False,
+    ) -> "SimResults":
         """Create a SimResults object from a text file. In other words,
         read in the simulation results file.
+
+        Args:
+            analysis_type (AnaType): analysis that created the file
+            filename (Path): text file results from a simulation
+            lean (bool): deduplicate while parsing and convert in place, so peak
+                memory is about the size of the results (not 4x)
+            dtype (type): np.float64, or np.float32 to halve memory
+            measure_memory (bool): record peak bytes per stage in mem_peaks
         """
+        peaks = StagePeaks(measure_memory)
         if analysis_type in TABLE_DATA:
             return cls(analysis_type, [], np.array([]), cls._table_processing(filename))
 
+        if lean:
+            results = cls._from_file_lean(analysis_type, filename, dtype, peaks)
+            results.mem_peaks = peaks.peaks
+            return results
+
         # if not table data, then it is plot data
-        (header1, data_plot1) = cls._plot_processing(filename)
+        with peaks.stage("parse"):
+            (header1, data_plot1) = cls._plot_processing(filename)
 
         # if frequency analysis
         if analysis_type in ["ac", "noise"]:
             # convert to mag and phase
-            (header2, data_plot2) = cls._mag_phase_convert(header1, data_plot1)
+            with peaks.stage("mag_phase"):
+                (header2, data_plot2) = cls._mag_phase_convert(header1, data_plot1)
             # remove duplicate columns
-            (header3, data_plot3) = cls._remove_dups(header2, data_plot2)
-            return cls(analysis_type, header3, data_plot3, {})
-
-        # if not frequency analysis, time or valtage x-axis
-        (header2, data_plot2) = cls._remove_dups(header1, data_plot1)
-        return cls(analysis_type, header2, data_plot2, {})
+            with peaks.stage("remove_dups"):
+                (header3, data_plot3) = cls._remove_dups(header2, data_plot2)
+        else:
+            # if not frequency analysis, time or valtage x-axis
+            with peaks.stage("remove_dups"):
+                (header3, data_plot3) = cls._remove_dups(header1, data_plot1)
+        # on this path the text is parsed as float64, then narrowed if asked
+        results = cls(
+            analysis_type, header3, data_plot3.astype(dtype, copy=False), {}
+        )
+        results.mem_peaks = peaks.peaks
+        return results
 
     def table_for_print(self) -> str:
         """Convert table data to a string for printing"""
 
+        # matplotlib imported here so parsing results does not load it
+        from matplotlib.ticker import EngFormatter
+
         # set up engineering notation function
         engFormat: EngFormatter = EngFormatter(places=3, sep="")
 
@@ -169,3 +315,16 @@ class SimResults:
             formatted_row = f"{key:<{padding}}{value_str}"
             result += formatted_row + "\n"
         return result
+
+    def to_arrow(self, params: Optional[dict[str, Any]] = None) -> Any:
+        """Convert to an Arrow table. Analysis type, header, units and sweep
+        parameters are stored as metadata. Needs pyarrow."""
+        if self.analysis_type in TABLE_DATA:
+            return table_to_arrow(self.analysis_type, self.data_table, params)
+        return plot_to_arrow(self.analysis_type, self.header, self.data_plot, params)
+
+    def to_parquet(
+        self, filename: Path, params: Optional[dict[str, Any]] = None
+    ) -> None:
+        """Write to a Parquet file (with metadata). Needs pyarrow."""
+        write_parquet(self.to_arrow(params), filename)
@@ -21,6 +21,7 @@ class Simulate:
         self.transcript_filename: Path = transcript_filename
         self.name: str = name
         self.timeout: int = timeout
+        self.timed_out: bool = False  # set by run()
         self.transcript_content: str = (
             f"\n-----------------\nSimulation name: {self.name}"
         )
@@ -55,4 +56,5 @@ class Simulate:
                 file.write(self.transcript_content)
 
         except subprocess.TimeoutExpired:
+            self.timed_out = True
             print("Simulation timed out.")
@@ -0,0 +1,168 @@
+"""Spectral analysis (FFT, PSD, THD) of transient results"""
+
+from functools import cached_property
+from typing import Literal, Optional, TypeAlias
+
+import numpy as np
+import numpy.typing as npt
+from scipy.interpolate import interp1d  # type: ignore
+from scipy.signal import detrend as sig_detrend  # type: ignore
+from scipy.signal import get_window  # type: ignore
+
+from .globals_types import TIME_AXIS, numpy_flt
+from .sim_results import SimResults
+from .waveforms import Waveforms
+
+# type aliases
+numpy_cplx: TypeAlias = npt.NDArray[np.complex128]
+Detrend = Literal["none", "constant", "linear"]
+
+
+class Spectrum:
+    """Spectra of one or more signals from a transient simulation.
+
+    The signals (columns of data, x-axis in column 0) are resampled once to a
+    uniform grid, which is cached. All spectra are then computed on that grid with
+    one rFFT over all the requested columns.
+    """
+
+    def __init__(
+        self,
+        header: list[str],
+        data: numpy_flt,
+        npts: Optional[int] = None,
+        x_begin: Optional[float] = None,
+        x_end: Optional[float] = None,
+    ) -> None:
+        self.header: list[str] = header
+        self.data: numpy_flt = data
+        self.npts: int = npts if npts is not None else data.shape[0]
+        self.x_begin: float = x_begin if x_begin is not None else data[0, 0]
+        self.x_end: float = x_end if x_end is not None else data[-1, 0]
+        self._fft_cache: dict[tuple[str, Detrend, tuple[int, ...]], numpy_cplx] = {}
+
+    @classmethod
+    def from_sim_results(
+        cls, results: SimResults, npts: Optional[int] = None
+    ) -> "Spectrum":
+        """Create a Spectrum object from transient SimResults"""
+        if results.analysis_type not in TIME_AXIS:
+            raise ValueError(
+                f"Error: spectrum needs a time axis, not {results.analysis_type}"
+            )
+        return cls(results.header, results.data_plot, npts)
+
+    @classmethod
+    def from_waveforms(cls, waves: Waveforms) -> "Spectrum":
+        """Create a Spectrum object from Waveforms (already uniformly spaced)"""
+        return cls(waves.header, waves.data)
+
+    @cached_property
+    def resampled(self) -> numpy_flt:
+        """Data on a uniform x grid. Interpolated only once, and only if needed"""
+        x_orig: numpy_flt = self.data[:, 0]
+        x_new: numpy_flt = np.linspace(self.x_begin, self.x_end, self.npts)
+
+        # already uniform (e.g. from Waveforms), use as is. The tolerance is a
+        # fraction of the grid step, so short (ns) windows are checked too
+        atol = 1e-6 * abs(self.sample_spacing)
+        if len(x_orig) == self.npts and np.allclose(x_orig, x_new, rtol=0, atol=atol):
+            return self.data
+
+        new_array: numpy_flt = np.empty((self.npts, self.data.shape[1]))
+        new_array[:, 0] = x_new
+        funct = interp1d(x_orig, self.data[:, 1:], axis=0)  # all columns at once
+        new_array[:, 1:] = funct(x_new)
+        return new_array
+
+    @property
+    def sample_spacing(self) -> float:
+        """x step of the uniform grid"""
+        return (self.x_end - self.x_begin) / (self.npts - 1)
+
+    @property
+    def freqs(self) -> numpy_flt:
+        """frequencies of the spectrum bins"""
+        return np.fft.rfftfreq(self.npts, self.sample_spacing).astype(np.float64)
+
+    def _columns(self, vecs: list[str]) -> tuple[int, ...]:
+        """column indices of the signal names"""
+        return tuple(self.header.index(vec) for vec in vecs)
+
+    def _window(self, window: str) -> numpy_flt:
+        """window coefficients for the grid length"""
+        return get_window(window, self.npts)
+
+    def _fft(self, vecs: list[str], window: str, detrend: Detrend) -> numpy_cplx:
+        """rFFT of the windowed signals, one column per signal"""
+        columns = self._columns(vecs)
+        key = (window, detrend, columns)
+        if key not in self._fft_cache:
+            sigs: numpy_flt = self.resampled[:, list(columns)]
+            if detrend != "none":
+                sigs = sig_detrend(sigs, axis=0, type=detrend)
+            win = self._window(window)
+            self._fft_cache[key] = np.fft.rfft(sigs * win[:, np.newaxis], axis=0)
+        return self._fft_cache[key]
+
+    def magnitude(
+        self, vecs: list[str], window: str = "hann", detrend: Detrend = "none"
+    ) -> numpy_flt:
+        """Single-sided amplitude spectrum (peak units), one column per signal"""
+        win_sum = np.sum(self._window(window))
+        mag = np.abs(self._fft(vecs, window, detrend)) / win_sum
+        mag[1:] *= 2  # fold in the negative frequencies
+        if self.npts % 2 == 0:
+            mag[-1] /= 2  # Nyquist bin has no negative frequency twin
+        return mag
+
+    def psd(
+        self, vecs: list[str], window: str = "hann", detrend: Detrend = "constant"
+    ) -> numpy_flt:
+        """Single-sided power spectral density (units^2/Hz), one column per signal"""
+        sample_rate = 1 / self.sample_spacing
+        win_sq_sum = np.sum(self._window(window) ** 2)
+        psd = np.abs(self._fft(vecs, window, detrend)) ** 2 / (sample_rate * win_sq_sum)
+        psd[1:] *= 2
+        if self.npts % 2 == 0:
+            psd[-1] /= 2
+        return psd
+
+    def thd(
+        self,
+        vecs: list[str],
+        fundamental: float,
+        harmonics: int = 10,
+        window: str = "hann",
+        bins: int = 2,
+    ) -> dict[str, float]:
+        """Total harmonic distortion (ratio, not %) of each signal.
+
+        Args:
+            vecs (list[str]): signal names
+            fundamental (float): frequency of the fundamental
+            harmonics (int): highest harmonic included
+            window (str): window name (scipy.signal.get_window)
+            bins (int): bins on each side of a harmonic summed into its power
+
+        Returns:
+            dict[str, float]: THD of each signal
+        """
+        power = self.psd(vecs, window, "constant")
+        freq_step = self.freqs[1]
+
+        # bins around each harmonic (rows: harmonic, cols: neighboring bins)
+        orders = np.arange(1, harmonics + 1)
+        centers = np.rint(orders * fundamental / freq_step).astype(int)
+        if centers[0] - bins < 1:  # bins would reach DC, or wrap to the end
+            raise ValueError(
+                f"Error: fundamental {fundamental} is within {bins} bins of DC"
+            )
+        centers = centers[centers + bins < len(power)]
+        if len(centers) < 2:
+            raise ValueError("Error: not enough harmonics below Nyquist frequency")
+        neighbors = centers[:, np.newaxis] + np.arange(-bins, bins + 1)
+
+        harm_power = power[neighbors].sum(axis=1)  # (harmonic, signal)
+        thd = np.sqrt(harm_power[1:].sum(axis=0) / harm_power[0])
+        return dict(zip(vecs, thd.tolist()))
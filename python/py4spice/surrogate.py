@@ -0,0 +1,129 @@
+"""Response-surface surrogate of a metric over circuit parameters"""
+
+from typing import Any, Callable, Optional
+
+import numpy as np
+from scipy.interpolate import RBFInterpolator  # type: ignore
+
+from .globals_types import numpy_flt
+from .table_store import TableStore
+
+
+class Surrogate:
+    """Interpolating model of a scalar metric built from simulated sweep points.
+
+    Queries are answered by a thin-plate-spline RBF. The error estimate is the
+    difference to a second (linear kernel) RBF through the same points; outside
+    the simulated parameter range it is infinite. get() only simulates when the
+    estimate is above tolerance, and adds the new point to the model.
+    """
+
+    def __init__(self, param_names: list[str], log_params: Optional[list[str]] = None):
+        self.param_names: list[str] = param_names
+        self.log_params: set[str] = set(log_params or [])  # e.g. capacitor values
+        self.points: numpy_flt = np.empty((0, len(param_names)))
+        self.values: numpy_flt = np.empty(0)
+        self._models: Optional[tuple[Any, Any]] = None  # (smooth, linear) RBFs
+        self._lo: numpy_flt = np.empty(0)
+        self._hi: numpy_flt = np.empty(0)
+        self.sim_count: int = 0  # simulations run by get()
+
+    @classmethod
+    def from_table_store(
+        cls,
+        store: TableStore,
+        param_names: list[str],
+        quantity: str,
+        log_params: Optional[list[str]] = None,
+    ) -> "Surrogate":
+        """Surrogate of one quantity of stored sweep results"""
+        surrogate = cls(param_names, log_params)
+        store_params = store.params
+        points = np.column_stack(
+            [store_params[name].astype(float) for name in param_names]
+        )
+        values = store[quantity]
+        valid = ~np.isnan(values) & ~np.isnan(points).any(axis=1)
+        surrogate.add(points[valid], values[valid])
+        return surrogate
+
+    def _scaled(self, points: numpy_flt) -> numpy_flt:
+        """parameters mapped to about [0, 1] (log10 first for log_params), so
+        that every parameter counts the same in the RBF distances"""
+        scaled = np.array(points, dtype=float, ndmin=2)
+        for i, name in enumerate(self.param_names):
+            if name in self.log_params:
+                scaled[:, i] = np.log10(scaled[:, i])
+        span = np.where(self._hi > self._lo, self._hi - self._lo, 1.0)
+        return (scaled - self._lo) / span
+
+    def add(self, points: numpy_flt, values: numpy_flt) -> None:
+        """Add simulated points (rows: points, columns: param_names)"""
+        points = np.array(points, dtype=float, ndmin=2)
+        self.points = np.vstack([self.points, points])
+        self.values = np.concatenate([self.values, np.ravel(values)])
+        self._models = None  # refit on the next query
+
+    def _fit(self) -> tuple[Any, Any]:
+        """(re)build the interpolators from all points"""
+        if self._models is None:
+            unscaled = self.points.copy()
+            for i, name in enumerate(self.param_names):
+                if name in self.log_params:
+                    unscaled[:, i] = np.log10(unscaled[:, i])
+            self._lo = unscaled.min(axis=0)
+            self._hi = unscaled.max(axis=0)
+            scaled = self._scaled(self.points)
+            self._models = (
+                RBFInterpolator(scaled, self.values, kernel="thin_plate_spline"),
+                RBFInterpolator(scaled, self.values, kernel="linear"),
+            )
+        return self._models
+
+    def query(self, points: numpy_flt) -> tuple[numpy_flt, numpy_flt]:
+        """Predicted metric and error estimate at one or more points
+
+        Args:
+            points (numpy_flt): rows: points, columns: param_names
+
+        Returns:
+            tuple[numpy_flt, numpy_flt]: predictions and error estimates
+        """
+        if len(self.values) <= len(self.param_names):
+            raise ValueError("Error: not enough points to build the surrogate")
+        smooth, linear = self._fit()
+        scaled = self._scaled(points)
+        predicted = smooth(scaled)
+        error = np.abs(predicted - linear(scaled))
+        outside = ((scaled < -1e-9) | (scaled > 1 + 1e-9)).any(axis=1)
+        error[outside] = np.inf  # no extrapolation
+        return predicted, error
+
+    def get(
+        self,
+        params: dict[str, float],
+        simulate: Callable[[dict[str, float]], float],
+        tol: float,
+    ) -> tuple[float, bool]:
+        """Metric at params, from the model if its error estimate is within tol,
+        otherwise from simulate (which is then added to the model)
+
+        Args:
+            params (dict[str, float]): value of each parameter
+            simulate (Callable[[dict[str, float]], float]): runs ngspice and
+                returns the metric (e.g. wraps ParamSearch.evaluate)
+            tol (float): largest acceptable error estimate
+
+        Returns:
+            tuple[float, bool]: metric, and True if it was simulated
+        """
+        point = np.array([[params[name] for name in self.param_names]])
+        if len(self.values) > len(self.param_names):
+            predicted, error = self.query(point)
+            if error[0] <= tol:
+                return float(predicted[0]), False
+
+        value = float(simulate(params))
+        self.sim_count += 1
+        self.add(point, np.array([value]))
+        return value, True
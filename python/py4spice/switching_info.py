@@ -0,0 +1,215 @@
+"""Cycle-by-cycle measurements of switching (periodic) waveforms"""
+
+from typing import Optional
+import numpy as np
+from .globals_types import numpy_flt
+
+
+class SwitchingInfo:
+    """Measurements of a periodic waveform, segmented into switching cycles.
+
+    Cycles are defined by the rising edges of a clock signal or, if no clock is
+    given, by a known switching frequency. The simulator's (non-uniform) time
+    points are kept and the cycle edges are inserted into them, so each signal is
+    treated as piecewise linear and integrated exactly. All cycles are reduced at
+    once with np.ufunc.reduceat.
+    """
+
+    def __init__(
+        self,
+        x_array_in: numpy_flt,
+        y_array_in: numpy_flt,
+        fsw: Optional[float] = None,
+        clock: Optional[numpy_flt] = None,
+        x_offset: float = 0.0,
+        clock_thres: Optional[float] = None,
+    ) -> None:
+        self.x_array_in = x_array_in
+        self.y_array_in = y_array_in
+        self.fsw = fsw
+        self.clock = clock
+        self.x_offset = x_offset  # fsw only: x of first cycle edge after x[0]
+        self.clock_thres = clock_thres  # clock only: None, midway min and max
+        self.settle_err_percent = 0.01  # cycle-to-cycle change of the average
+        self.settled_only = True  # measurements only cover settled cycles
+
+        if fsw is None and clock is None:
+            raise ValueError("Error: SwitchingInfo needs either fsw or clock")
+
+        self.edges: numpy_flt = self._find_edges()
+        if len(self.edges) < 2:
+            raise ValueError("Error: waveform does not contain a full cycle")
+
+        # merge cycle edges into the x points, only keeping the full cycles
+        x_seg = np.union1d(x_array_in, self.edges)
+        in_cycles = (x_seg >= self.edges[0]) & (x_seg <= self.edges[-1])
+        self.x_seg: numpy_flt = x_seg[in_cycles]
+        self.dx_seg: numpy_flt = np.diff(self.x_seg)
+
+        # index (into x_seg) of the first point of each cycle
+        self.starts = np.searchsorted(self.x_seg, self.edges[:-1])
+        self.ends = np.append(self.starts[1:], len(self.x_seg) - 1)
+
+    def _find_edges(self) -> numpy_flt:
+        """X values where each switching cycle begins (and the last one ends)"""
+        x = self.x_array_in
+        if self.clock is not None:
+            clk = self.clock
+            thres = self.clock_thres
+            if thres is None:
+                thres = (np.max(clk) + np.min(clk)) / 2
+            above = clk >= thres
+            idx = np.flatnonzero(~above[:-1] & above[1:])  # rising crossings
+
+            # interpolate between the two points of each crossing
+            x0, x1 = x[idx], x[idx + 1]
+            y0, y1 = clk[idx], clk[idx + 1]
+            return x0 + (thres - y0) * (x1 - x0) / (y1 - y0)
+
+        period = 1 / self.fsw  # type: ignore[operator]
+        first = x[0] + self.x_offset
+        count = int(np.floor((x[-1] - first) / period * (1 + 1e-9)))
+        return first + np.arange(count + 1) * period
+
+    def _on_segments(self, y_array: numpy_flt) -> numpy_flt:
+        """Y values at the segmentation points (x_seg)"""
+        return np.interp(self.x_seg, self.x_array_in, y_array)
+
+    def _select(self, per_cycle: numpy_flt) -> numpy_flt:
+        """Limit per-cycle results to the settled cycles, if requested"""
+        if self.settled_only:
+            return per_cycle[self.steady_cycle:]
+        return per_cycle
+
+    def _integrate(self, seg_values: numpy_flt) -> numpy_flt:
+        """Sum per-segment integrals into per-cycle integrals"""
+        return np.add.reduceat(seg_values, self.starts)
+
+    @property
+    def cycle_count(self) -> int:
+        """number of full cycles"""
+        return len(self.edges) - 1
+
+    @property
+    def periods(self) -> numpy_flt:
+        """length of each cycle"""
+        return np.diff(self.edges)
+
+    def _average_all(self, y_array: numpy_flt) -> numpy_flt:
+        """average of y for every cycle"""
+        y = self._on_segments(y_array)
+        areas = 0.5 * (y[:-1] + y[1:]) * self.dx_seg
+        return self._integrate(areas) / self.periods
+
+    def cycle_average(self, y_array: numpy_flt) -> numpy_flt:
+        """Average value of a signal (same x as y_array_in) per cycle"""
+        return self._select(self._average_all(y_array))
+
+    def cycle_rms(self, y_array: numpy_flt) -> numpy_flt:
+        """RMS value of a signal per cycle"""
+        y = self._on_segments(y_array)
+        a, b = y[:-1], y[1:]
+        areas = (a * a + a * b + b * b) * self.dx_seg / 3
+        return self._select(np.sqrt(self._integrate(areas) / self.periods))
+
+    def _max_all(self, y_array: numpy_flt) -> numpy_flt:
+        """maximum of y for every cycle"""
+        y = self._on_segments(y_array)
+        y_max = np.maximum.reduceat(y[:-1], self.starts)
+        return np.maximum(y_max, y[self.ends])
+
+    def _min_all(self, y_array: numpy_flt) -> numpy_flt:
+        """minimum of y for every cycle"""
+        y = self._on_segments(y_array)
+        y_min = np.minimum.reduceat(y[:-1], self.starts)
+        return np.minimum(y_min, y[self.ends])
+
+    def cycle_max(self, y_array: numpy_flt) -> numpy_flt:
+        """Maximum value of a signal per cycle"""
+        return self._select(self._max_all(y_array))
+
+    def cycle_min(self, y_array: numpy_flt) -> numpy_flt:
+        """Minimum value of a signal per cycle"""
+        return self._select(self._min_all(y_array))
+
+    def cycle_ripple(self, y_array: numpy_flt) -> numpy_flt:
+        """Peak-to-peak value of a signal per cycle"""
+        return self.cycle_max(y_array) - self.cycle_min(y_array)
+
+    def cycle_duty(
+        self, y_array: numpy_flt, thres: Optional[float] = None
+    ) -> numpy_flt:
+        """Fraction of each cycle the signal is above a threshold.
+        The threshold defaults to halfway between each cycle's min and max."""
+        y = self._on_segments(y_array)
+        a, b = y[:-1], y[1:]
+
+        if thres is None:
+            mids = (self._max_all(y_array) + self._min_all(y_array)) / 2
+            seg_thres = np.repeat(mids, np.diff(np.append(self.starts, len(a))))
+        else:
+            seg_thres = np.full(len(a), thres)
+
+        # part of each linear segment that is above the threshold
+        hi = np.maximum(a, b)
+        lo = np.minimum(a, b)
+        span = hi - lo
+        frac = np.divide(
+            hi - seg_thres, span, out=(a >= seg_thres).astype(float), where=span > 0
+        )
+        time_above = np.clip(frac, 0.0, 1.0) * self.dx_seg
+        return self._select(self._integrate(time_above) / self.periods)
+
+    def cycle_power(self, v_array: numpy_flt, i_array: numpy_flt) -> numpy_flt:
+        """Average power (v * i) per cycle"""
+        v = self._on_segments(v_array)
+        i = self._on_segments(i_array)
+        v0, v1, i0, i1 = v[:-1], v[1:], i[:-1], i[1:]
+        areas = (2 * v0 * i0 + v0 * i1 + v1 * i0 + 2 * v1 * i1) * self.dx_seg / 6
+        return self._select(self._integrate(areas) / self.periods)
+
+    def cycle_efficiency(
+        self,
+        vin_array: numpy_flt,
+        iin_array: numpy_flt,
+        vout_array: numpy_flt,
+        iout_array: numpy_flt,
+    ) -> numpy_flt:
+        """Output power divided by input power per cycle"""
+        pin = self.cycle_power(vin_array, iin_array)
+        pout = self.cycle_power(vout_array, iout_array)
+        return np.divide(pout, pin, out=np.zeros_like(pout), where=pin != 0)
+
+    @property
+    def steady_cycle(self) -> int:
+        """Index of the first cycle after which the cycle average of y stops
+        changing by more than settle_err_percent"""
+        avg = self._average_all(self.y_array_in)
+        if len(avg) < 2:
+            return 0
+        scale = max(float(np.abs(avg[-1])), np.finfo(float).tiny)
+        changes = np.abs(np.diff(avg))
+        unsettled = np.flatnonzero(changes > scale * self.settle_err_percent)
+        if len(unsettled) == 0:
+            return 0
+        return min(int(unsettled[-1]) + 1, len(avg) - 1)
+
+    @property
+    def average(self) -> numpy_flt:
+        """average of y per cycle"""
+        return self.cycle_average(self.y_array_in)
+
+    @property
+    def rms(self) -> numpy_flt:
+        """RMS of y per cycle"""
+        return self.cycle_rms(self.y_array_in)
+
+    @property
+    def ripple(self) -> numpy_flt:
+        """peak-to-peak ripple of y per cycle"""
+        return self.cycle_ripple(self.y_array_in)
+
+    @property
+    def duty_cycle(self) -> numpy_flt:
+        """duty cycle of y per cycle"""
+        return self.cycle_duty(self.y_array_in)
@@ -0,0 +1,143 @@
+"""Columnar store of table results (op, tf, sens) gathered over many runs"""
+
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from .globals_types import TABLE_DATA, AnaType, numpy_flt
+from .sim_results import SimResults
+
+
+class TableStore:
+    """Table results of many runs: one array per quantity (one row per run),
+    plus one array per sweep parameter. Quantities missing in a run are NaN.
+
+    store["v(out)"] and store.params["rload"] give "v(out) vs rload" across all
+    runs as two arrays.
+    """
+
+    def __init__(self, analysis_type: AnaType, capacity: int = 64) -> None:
+        if analysis_type not in TABLE_DATA:
+            raise ValueError(f"Error: {analysis_type} results are not table data")
+        self.analysis_type: AnaType = analysis_type
+        self.quantities: list[str] = []
+        self._index: dict[str, int] = {}  # quantity -> column
+        self._values: numpy_flt = np.full((capacity, 0), np.nan)
+        self._params: dict[str, list[Any]] = {}
+        self.runs: int = 0
+
+    def _reserve(self, rows: int, quantities: list[str]) -> None:
+        """make room for more rows and new quantity columns"""
+        new_quantities = [qty for qty in quantities if qty not in self._index]
+        for qty in new_quantities:
+            self._index[qty] = len(self.quantities)
+            self.quantities.append(qty)
+
+        needed_rows = self.runs + rows
+        capacity = self._values.shape[0]
+        if needed_rows > capacity or new_quantities:
+            capacity = max(capacity, 1)
+            while capacity < needed_rows:
+                capacity *= 2  # grow geometrically, like a list
+            grown: numpy_flt = np.full((capacity, len(self.quantities)), np.nan)
+            grown[: self.runs, : self._values.shape[1]] = self._values[: self.runs]
+            self._values = grown
+
+    def _add_params(self, params_list: list[dict[str, Any]]) -> None:
+        """append sweep parameters (None where a run does not have one)"""
+        names = set(self._params).union(*params_list)
+        for name in names:
+            column = self._params.setdefault(name, [None] * self.runs)
+            column.extend(params.get(name) for params in params_list)
+
+    def add(
+        self, data_table: dict[str, float], params: Optional[dict[str, Any]] = None
+    ) -> None:
+        """Add the table of one run"""
+        self._reserve(1, list(data_table))
+        columns = [self._index[qty] for qty in data_table]
+        self._values[self.runs, columns] = list(data_table.values())
+        self._add_params([params or {}])
+        self.runs += 1
+
+    def add_results(
+        self, results: SimResults, params: Optional[dict[str, Any]] = None
+    ) -> None:
+        """Add the table of a SimResults object"""
+        if results.analysis_type != self.analysis_type:
+            raise ValueError(
+                f"Error: cannot add {results.analysis_type} to {self.analysis_type}"
+            )
+        self.add(results.data_table, params)
+
+    def read_files(
+        self,
+        filenames: list[Path],
+        params_list: Optional[list[dict[str, Any]]] = None,
+    ) -> None:
+        """Bulk read many table result files (1st word: key, last word: value),
+        straight into the store without a dict per file"""
+        params_list = params_list or [{} for _ in filenames]
+        if len(params_list) != len(filenames):
+            raise ValueError("Error: need one params dict for each file")
+
+        rows: list[int] = []
+        keys: list[str] = []
+        values: list[float] = []
+        for row, filename in enumerate(filenames):
+            with open(filename, "r", encoding="utf-8") as file:
+                for line in file:
+                    words = line.split()
+                    if words:
+                        rows.append(row)
+                        keys.append(words[0])
+                        values.append(float(words[-1]))
+
+        self._reserve(len(filenames), list(dict.fromkeys(keys)))
+        columns = [self._index[key] for key in keys]
+        self._values[np.array(rows, dtype=int) + self.runs, columns] = values
+        self._add_params(params_list)
+        self.runs += len(filenames)
+
+    @classmethod
+    def from_files(
+        cls,
+        analysis_type: AnaType,
+        filenames: list[Path],
+        params_list: Optional[list[dict[str, Any]]] = None,
+    ) -> "TableStore":
+        """Create a TableStore from many table result files"""
+        store = cls(analysis_type, capacity=max(len(filenames), 1))
+        store.read_files(filenames, params_list)
+        return store
+
+    @property
+    def values(self) -> numpy_flt:
+        """2D array of all results (rows: runs, columns: quantities)"""
+        return self._values[: self.runs]
+
+    @property
+    def params(self) -> dict[str, np.ndarray]:
+        """sweep parameters, one array per parameter"""
+        return {name: np.array(column) for name, column in self._params.items()}
+
+    def __getitem__(self, quantity: str) -> numpy_flt:
+        """one quantity across all runs (a view, not a copy)"""
+        return self._values[: self.runs, self._index[quantity]]
+
+    def __len__(self) -> int:
+        return self.runs
+
+    def row(self, run: int) -> dict[str, float]:
+        """table of one run, as SimResults.data_table"""
+        row_values = self._values[run]
+        return {
+            qty: float(row_values[i])
+            for i, qty in enumerate(self.quantities)
+            if not np.isnan(row_values[i])
+        }
+
+    def sim_results(self, run: int) -> SimResults:
+        """SimResults object of one run"""
+        return SimResults(self.analysis_type, [], np.array([]), self.row(run))
@@ -1,9 +1,23 @@
 """Vector set of signals for which to gather data, plot, ... """
 
+import fnmatch
+import re
+
+from .netlist import Netlist
+
+# v(pattern) or i(pattern)
+FUNC_PATTERN_RE = re.compile(r"^([vi])\((.+)\)$")
+
+# ngspice keywords that are not vector names
+KEYWORDS: set[str] = {"all", "allv", "alli"}
+
 
 class Vectors:
+    """Ordered set of vector names. The order is kept (first occurrence wins) so
+    the wrdata columns are the same from run to run."""
+
     def __init__(self, data: str) -> None:
-        self.data = list(set(data.split()))
+        self.data = list(dict.fromkeys(data.split()))
 
     def __str__(self) -> str:
         return " ".join(self.data)
@@ -13,5 +27,40 @@ class Vectors:
 
     def __add__(self, other: "Vectors") -> "Vectors":
         combined = self.data + other.data
-        unique_combined = list(set(combined))
-        return Vectors(" ".join(unique_combined))
+        return Vectors(" ".join(combined))
+
+    def expand(self, netlist: Netlist) -> "Vectors":
+        """Expand wildcard patterns against the nodes and branch currents of a
+        netlist: "out*" and "v(out*)" match node names, "i(*)" matches branch
+        currents (voltage sources, inductors, ...). Names without wildcards are
+        kept as they are.
+
+        Args:
+            netlist (Netlist): circuit to match the patterns against
+
+        Returns:
+            Vectors: expanded vectors, in pattern then netlist order
+        """
+        nodes = netlist.nodes()
+        branches = netlist.branch_currents()
+        expanded: list[str] = []
+        for name in self.data:
+            if not any(char in name for char in "*?["):
+                expanded.append(name)
+                continue
+            match = FUNC_PATTERN_RE.match(name)
+            if match is None:  # bare node pattern
+                expanded.extend(fnmatch.filter(nodes, name))
+            elif match.group(1) == "v":
+                matched = fnmatch.filter(nodes, match.group(2))
+                expanded.extend(f"v({node})" for node in matched)
+            else:
+                expanded.extend(fnmatch.filter(branches, name))
+        return Vectors(" ".join(expanded))
+
+    def save_line(self) -> str:
+        """ngspice 'save' command so only these vectors are kept in memory and
+        written. Blank if a keyword such as "all" is in the vectors."""
+        if not self.data or KEYWORDS.intersection(self.data):
+            return ""
+        return f"save {self}"
@@ -1,9 +1,13 @@
-from typing import TypeAlias
+from pathlib import Path
+from typing import Any, Optional, TypeAlias
 
 import numpy as np
 import numpy.typing as npt
 from scipy.interpolate import interp1d  # type: ignore
 
+from .arrow_io import plot_to_arrow, write_parquet
+from .globals_types import AnaType
+
 numpy_flt: TypeAlias = npt.NDArray[np.float64]
 
 
@@ -15,15 +19,16 @@ class Waveforms:
         self.header: list[str] = header
 
         column_count: int = data.shape[1]  # number of columns
-        self.data: numpy_flt = np.zeros((npts, column_count))
+        self.data: numpy_flt = np.empty((npts, column_count), dtype=data.dtype)
         self.data[:, 0] = np.linspace(data[0, 0], data[-1, 0], npts)
 
-        # interpolate y-values for each column
+        # interpolate y-values for each column, written straight into self.data.
+        # np.interp needs rising x; a falling sweep (dc vin 15 0 -1) is sorted
+        if np.any(np.diff(data[:, 0]) < 0):
+            data = data[np.argsort(data[:, 0], kind="stable")]
         x: numpy_flt = data[:, 0]
         for i in range(1, column_count):
-            y: numpy_flt = data[:, i]
-            f = interp1d(x, y)
-            self.data[:, i] = f(self.data[:, 0])
+            self.data[:, i] = np.interp(self.data[:, 0], x, data[:, i])
 
     @property
     def npts(self) -> int:
@@ -43,10 +48,12 @@ class Waveforms:
             indices_for_deletion.sort(reverse=True)
             del indices_for_deletion[-1]  # remove index 0 (x-axis) from list
 
-            # Delete header names & data columns, starting from end, working backwards
+            # Delete header names, starting from end, working backwards
             for i in indices_for_deletion:
                 del self.header[i]
-                self.data = np.delete(self.data, i, axis=1)
+
+            # Delete data columns in one step (one copy, not one per column)
+            self.data = np.delete(self.data, indices_for_deletion, axis=1)
         else:
             print("Error: vecs is not a subset of the header list")
 
@@ -113,3 +120,19 @@ class Waveforms:
         )
 
         self.new_wave(result_name, result)
+
+    def to_arrow(
+        self, analysis_type: AnaType, params: Optional[dict[str, Any]] = None
+    ) -> Any:
+        """Convert to an Arrow table, with metadata. Needs pyarrow. Waveforms
+        do not know their analysis, so analysis_type (tran, dc, ...) is given."""
+        return plot_to_arrow(analysis_type, self.header, self.data, params)
+
+    def to_parquet(
+        self,
+        filename: Path,
+        analysis_type: AnaType,
+        params: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """Write to a Parquet file (with metadata). Needs pyarrow."""
+        write_parquet(self.to_arrow(analysis_type, params), filename)